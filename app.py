@@ -1,32 +1,61 @@
+# Monkey-patch before anything else so subprocess, requests and the
+# socket layer become cooperative under the eventlet hub.
+import eventlet
+eventlet.monkey_patch()
+
 import os
 import time
 import json
 import argparse
-import threading
 import subprocess
 import psutil
 from datetime import datetime, timedelta
 from flask import Flask, render_template, request
 from flask_socketio import SocketIO, emit
 
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+
+class _OrjsonModule:
+    """
+    json-module shim so Flask-SocketIO can serialize packets with orjson.
+    python-socketio passes stdlib kwargs (separators etc.) that orjson
+    doesn't take; they only control whitespace, so they are dropped.
+    """
+    @staticmethod
+    def dumps(obj, **kwargs):
+        return orjson.dumps(obj).decode()
+
+    @staticmethod
+    def loads(s, **kwargs):
+        return orjson.loads(s)
 
 # Configuration
 app = Flask(__name__)
 # Enable cors_allowed_origins='*' for development flexibility
-socketio = SocketIO(app, cors_allowed_origins='*')
+socketio = SocketIO(app, cors_allowed_origins='*', json=_OrjsonModule)
 
 # RabbitMQ Defaults
 RABBITMQ_URL = "http://192.168.0.205:15672/api/overview"
 RABBITMQ_AUTH = ('admin', 'Admin@123')
 
-# History Persistence
-HISTORY_FILE = 'stats_history.json'
+# Keep-alive session so each poll reuses one TCP connection instead of
+# re-handshaking every few seconds; a single-slot pool is all we need.
+_rmq_session = requests.Session()
+_rmq_session.auth = RABBITMQ_AUTH
+_rmq_session.mount('http://', HTTPAdapter(pool_connections=1, pool_maxsize=1))
+_rmq_session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=1))
+
+# History Persistence (JSON Lines: one point per line, O(1) append)
+HISTORY_FILE = 'stats_history.jsonl'
+LEGACY_HISTORY_FILE = 'stats_history.json' # pre-JSONL format (single array)
 MAX_HISTORY_POINTS = 288 # 24 hours * 12 points/hour (5 min interval)
 
-# Global background thread control
-monitor_thread = None
-thread_lock = threading.Lock()
+# Global background task control. A plain flag is enough: greenlets are
+# cooperative (no preemption between check and set), and under threading
+# mode the GIL makes the attribute store atomic.
+_monitor_started = False
 
 # Paths
 # Default to /home/ctiserver if it exists (specific user request), otherwise fallback to ~
@@ -37,26 +66,54 @@ OPENCTI_DIR = POSSIBLE_HOME if os.path.isdir('/home/ctiserver') else os.path.joi
 DOCKER_DIR = os.path.join(OPENCTI_DIR, 'docker')
 CONNECTORS_DIR = os.path.join(OPENCTI_DIR, 'connectors')
 
+# Compose names the core project after its directory
+_CORE_PROJECT = os.path.basename(DOCKER_DIR).lower()
+
+# Compose command constants, built once instead of per action
+_UP_CMD = ('docker', 'compose', 'up', '-d')
+_DOWN_CMD = ('docker', 'compose', 'down')
+
+# Network counters from the previous call, so rates can be computed
+# against the last tick instead of blocking inside get_system_stats()
+_last_net = psutil.net_io_counters()
+_last_ts = time.monotonic()
+
+# Total RAM never changes; disk usage changes slowly, so one statvfs
+# every 30s is plenty for a dashboard.
+_RAM_TOTAL_GB = psutil.virtual_memory().total / (1024**3)
+DISK_POLL_SECS = 30
+_disk_cache = {'ts': 0.0, 'value': None}
+
 def get_system_stats():
     """Collects system metrics (CPU, RAM, Disk, Network)."""
+    global _last_net, _last_ts
     try:
-        net1 = psutil.net_io_counters()
-        # Use cpu_percent with interval to block for 0.1s, serving double duty for net stats delay
-        cpu_usage = psutil.cpu_percent(interval=0.1)
-        net2 = psutil.net_io_counters()
-        
-        # Bytes per second (approximation over small window)
-        bytes_sent_sec = (net2.bytes_sent - net1.bytes_sent) / 0.1
-        bytes_recv_sec = (net2.bytes_recv - net1.bytes_recv) / 0.1
+        now = time.monotonic()
+        net = psutil.net_io_counters()
+
+        # Bytes per second since the previous tick (no sleep needed)
+        dt = max(now - _last_ts, 1e-6)
+        bytes_sent_sec = (net.bytes_sent - _last_net.bytes_sent) / dt
+        bytes_recv_sec = (net.bytes_recv - _last_net.bytes_recv) / dt
+        _last_net, _last_ts = net, now
+
+        # interval=None compares against the previous call instead of blocking
+        # for 100ms. The very first call returns 0.0 (warm-up), which is fine.
+        cpu_usage = psutil.cpu_percent(interval=None)
 
         mem = psutil.virtual_memory()
-        disk = psutil.disk_usage('/')
+
+        disk = _disk_cache['value']
+        if disk is None or now - _disk_cache['ts'] > DISK_POLL_SECS:
+            disk = psutil.disk_usage('/')
+            _disk_cache['value'] = disk
+            _disk_cache['ts'] = now
 
         return {
             'cpu': cpu_usage,
             'ram': mem.percent,
             'ram_used': mem.used / (1024**3), # GB
-            'ram_total': mem.total / (1024**3), # GB
+            'ram_total': _RAM_TOTAL_GB, # GB
             'disk': disk.percent,
             'disk_used': disk.used / (1024**3), # GB
             'disk_total': disk.total / (1024**3), # GB
@@ -67,11 +124,15 @@ def get_system_stats():
         print(f"Error getting system stats: {e}")
         return {'cpu':0, 'ram':0, 'disk':0, 'net_in':0, 'net_out':0}
 
-def get_rabbitmq_stats():
+# Last RabbitMQ poll result, refreshed by rabbit_poll_loop so the monitor
+# never blocks on the management API (up to 2s per tick when it was down).
+_rabbit_cache = {'ts': 0.0, 'value': {'status': 'offline', 'error': 'not polled yet'}}
+
+def _fetch_rabbitmq_stats():
     """Fetches metrics from RabbitMQ Management API."""
     try:
         # /api/overview gives cluster-wide message rates and total queue stats
-        resp = requests.get(RABBITMQ_URL, auth=RABBITMQ_AUTH, timeout=2)
+        resp = _rmq_session.get(RABBITMQ_URL, timeout=1)
         if resp.status_code == 200:
             data = resp.json()
             queue_totals = data.get('queue_totals', {})
@@ -90,17 +151,26 @@ def get_rabbitmq_stats():
     except Exception as e:
         return {'status': 'offline', 'error': str(e)}
 
-def check_docker_status(cwd):
+def rabbit_poll_loop():
+    """Polls RabbitMQ every 5s and caches the result for the monitor."""
+    while True:
+        _rabbit_cache['value'] = _fetch_rabbitmq_stats()
+        _rabbit_cache['ts'] = time.monotonic()
+        socketio.sleep(5)
+
+def get_rabbitmq_stats():
+    """Returns the most recent cached RabbitMQ stats."""
+    return _rabbit_cache['value']
+
+# Greenlets used when the per-directory fallback has to fan out
+STATUS_POOL_SIZE = 16
+
+def _check_compose_dir_status(cwd):
     """
-    Checks if containers in a docker-compose directory are running.
-    Returns 'running' if at least one container is Up, else 'stopped'.
+    Per-directory 'docker compose ps' fallback, used only when the batched
+    'docker ps' label query fails (e.g. CLI too old for the format verb).
     """
     try:
-        if not os.path.exists(cwd):
-            return 'stopped'
-        
-        # 'docker compose ps --services --filter "status=running"' gives a list of running services
-        # If output is not empty, something is running.
         result = subprocess.run(
             ['docker', 'compose', 'ps', '--services', '--filter', 'status=running'],
             cwd=cwd,
@@ -115,15 +185,61 @@ def check_docker_status(cwd):
     except Exception:
         return 'stopped'
 
+def check_docker_status(cwd, running_projects=None, has_compose=True):
+    """
+    Checks if containers in a docker-compose directory are running.
+    Compose names the project after its directory by default, so this is a
+    set-membership test against the running project names instead of a
+    'docker compose ps' subprocess per directory. Callers that already
+    know the directory has no compose file can say so and skip the docker
+    query entirely.
+    """
+    try:
+        if not has_compose or not os.path.exists(cwd):
+            return 'stopped'
+        if running_projects is None:
+            running_projects = get_all_compose_projects_running()
+        if running_projects is None:
+            return _check_compose_dir_status(cwd)
+        return 'running' if os.path.basename(cwd).lower() in running_projects else 'stopped'
+    except Exception:
+        return 'stopped'
+
+def get_all_compose_projects_running(containers=None):
+    """
+    Returns the set of compose project names with at least one running
+    container, or None when the docker query itself fails. Pass a
+    pre-fetched get_running_containers() list so the status check and the
+    container list share a single subprocess call.
+    """
+    if containers is not None:
+        return {c['project'] for c in containers if c.get('project')}
+    try:
+        result = subprocess.run(
+            ['docker', 'ps', '--filter', 'status=running',
+             '--format', '{{.Label "com.docker.compose.project"}}'],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            timeout=5
+        )
+        if result.returncode != 0:
+            return None
+        return {line.strip() for line in result.stdout.splitlines() if line.strip()}
+    except Exception:
+        return None
+
 def get_running_containers():
     """
-    Returns a list of all running containers using docker ps.
+    Returns a list of all running containers using a single docker ps call.
+    Each entry carries its compose project so status checks can reuse it.
     """
     containers = []
     try:
-        # Format: ID|Names|Image|Status|RunningFor
+        # Format: ID|Names|Image|Status|RunningFor|ComposeProject
         result = subprocess.run(
-            ['docker', 'ps', '--format', '{{.ID}}|{{.Names}}|{{.Image}}|{{.Status}}|{{.RunningFor}}'],
+            ['docker', 'ps', '--format',
+             '{{.ID}}|{{.Names}}|{{.Image}}|{{.Status}}|{{.RunningFor}}|{{.Label "com.docker.compose.project"}}'],
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
             text=True
@@ -131,123 +247,258 @@ def get_running_containers():
         if result.returncode == 0 and result.stdout.strip():
             for line in result.stdout.strip().split('\n'):
                 parts = line.split('|')
-                if len(parts) >= 5:
+                if len(parts) >= 6:
                     containers.append({
                         'id': parts[0],
                         'name': parts[1],
                         'image': parts[2],
                         'status': parts[3],
-                        'uptime': parts[4]
+                        'uptime': parts[4],
+                        'project': parts[5]
                     })
     except Exception as e:
         print(f"Error listing containers: {e}")
     return containers
 
 
-def get_docker_status_update():
+def _find_compose_file(path):
+    """
+    Returns the path to the docker-compose file in a directory, or None.
+    One stat per candidate name instead of listing the whole directory.
+    """
+    for fname in ('docker-compose.yml', 'docker-compose.yaml'):
+        candidate = os.path.join(path, fname)
+        if os.path.isfile(candidate):
+            return candidate
+    return None
+
+# Cached connector directory scan, invalidated when CONNECTORS_DIR or any
+# connector subdirectory changes (mtime). Saves dozens of stat/getdents
+# syscalls per monitor tick for data that only changes on add/remove.
+_connector_cache = {'key': None, 'value': [], 'paths': {}}
+
+def _scan_connectors_cached():
+    """
+    Scans CONNECTORS_DIR and returns a sorted list of (name, path, compose_file)
+    tuples (compose_file is None if the directory has no docker-compose). The
+    result is cached against the mtimes of the directory and its children, so
+    repeated calls between filesystem changes are free.
+    """
+    if not os.path.isdir(CONNECTORS_DIR):
+        _reset_connector_cache()
+        return []
+    try:
+        key = [os.stat(CONNECTORS_DIR).st_mtime_ns]
+        dirs = []
+        # scandir gives is_dir() and stat() from one getdents buffer
+        with os.scandir(CONNECTORS_DIR) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    key.append((entry.name, entry.stat().st_mtime_ns))
+                    dirs.append((entry.name, entry.path))
+        key = tuple(key)
+        if key == _connector_cache['key']:
+            return _connector_cache['value']
+
+        value = []
+        for name, path in sorted(dirs):
+            value.append((name, path, _find_compose_file(path)))
+        _connector_cache['key'] = key
+        _connector_cache['value'] = value
+        _connector_cache['paths'] = {name: (path, compose_file)
+                                     for name, path, compose_file in value}
+        return value
+    except Exception as e:
+        print(f"Scan Error: {e}")
+        _reset_connector_cache()
+        return []
+
+def _reset_connector_cache():
+    """
+    Empties the scan cache including the paths side-table, so a vanished
+    CONNECTORS_DIR can't leave the config endpoints serving stale paths.
+    """
+    _connector_cache['key'] = None
+    _connector_cache['value'] = []
+    _connector_cache['paths'] = {}
+
+def get_docker_status_update(containers=None):
     """Helper to get full status update dict for all components."""
     status_update = {}
+    running_projects = get_all_compose_projects_running(containers)
+    connectors = [(name, path) for name, path, compose_file in _scan_connectors_cached()
+                  if compose_file]
+
+    if running_projects is None:
+        # Batched query failed; fan the per-directory checks out on a
+        # greenlet pool so the wait is the slowest check, not the sum.
+        pool = eventlet.GreenPool(STATUS_POOL_SIZE)
+        dirs = [DOCKER_DIR] + [path for name, path in connectors]
+        results = list(pool.imap(_check_compose_dir_status, dirs))
+        status_update['core'] = results[0]
+        for (name, path), status in zip(connectors, results[1:]):
+            status_update[f'connector_{name}'] = status
+        return status_update
+
     # Check Core
-    status_update['core'] = check_docker_status(DOCKER_DIR)
-    
+    status_update['core'] = check_docker_status(DOCKER_DIR, running_projects)
+
     # Check Connectors
-    if os.path.isdir(CONNECTORS_DIR):
-        try:
-            for name in os.listdir(CONNECTORS_DIR):
-                path = os.path.join(CONNECTORS_DIR, name)
-                if os.path.isdir(path):
-                    # Check for yml or yaml
-                    if 'docker-compose.yml' in os.listdir(path) or 'docker-compose.yaml' in os.listdir(path):
-                        status_update[f'connector_{name}'] = check_docker_status(path)
-        except Exception as e:
-            print(f"Scan Error: {e}")
+    for name, path in connectors:
+        status_update[f'connector_{name}'] = check_docker_status(path, running_projects)
     return status_update
 
 def scan_connectors():
     """Calculates the list of available connectors and their config status."""
-    connectors = []
-    if os.path.isdir(CONNECTORS_DIR):
+    return [{'name': name, 'has_config': compose_file is not None}
+            for name, path, compose_file in _scan_connectors_cached()]
+
+def _connector_paths():
+    """Dict of connector name -> (path, compose_file) from the cached scan."""
+    _scan_connectors_cached()
+    return _connector_cache['paths']
+
+def _project_status_key(project):
+    """Maps a compose project name to its status_update key, or None."""
+    if project == _CORE_PROJECT:
+        return 'core'
+    for name, path, compose_file in _scan_connectors_cached():
+        if compose_file and name.lower() == project:
+            return f'connector_{name}'
+    return None
+
+def _docker_events_loop():
+    """
+    Tails 'docker events' and pushes targeted status updates the moment a
+    container starts or stops, so the UI doesn't wait for the heartbeat
+    poll (and the heartbeat can run far less often).
+    """
+    while True:
         try:
-            for name in os.listdir(CONNECTORS_DIR):
-                path = os.path.join(CONNECTORS_DIR, name)
-                if os.path.isdir(path):
-                     has_config = 'docker-compose.yml' in os.listdir(path) or 'docker-compose.yaml' in os.listdir(path)
-                     connectors.append({'name': name, 'has_config': has_config})
+            process = subprocess.Popen(
+                ['docker', 'events', '--filter', 'type=container', '--format', '{{json .}}'],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True
+            )
+            for line in process.stdout:
+                try:
+                    event = json.loads(line)
+                except ValueError:
+                    continue
+                if event.get('status') not in ('start', 'die', 'stop'):
+                    continue
+                project = event.get('Actor', {}).get('Attributes', {}).get('com.docker.compose.project')
+                if not project:
+                    continue
+                key = _project_status_key(project)
+                if key is None:
+                    continue
+                # Re-check just this project; other containers of the same
+                # compose stack may still be up after a single 'die'.
+                running = get_all_compose_projects_running()
+                if running is None:
+                    continue
+                status = 'running' if project in running else 'stopped'
+                socketio.emit('status_update', _status_arrays({key: status}))
+                # A container came or went, so the containers table changed
+                # too -- push it now rather than waiting for the heartbeat.
+                socketio.emit('monitor_tick', {'containers': get_running_containers()})
+                # Force the next heartbeat to re-send the full sections
+                _last_hashes['status'] = None
+                _last_hashes['containers'] = None
+            process.wait()
         except Exception as e:
-            print(f"Scan Error: {e}")
-    connectors.sort(key=lambda x: x['name'])
-    return connectors
+            print(f"Docker events stream error: {e}")
+        # Stream died (daemon restart etc.) -- back off and reconnect
+        socketio.sleep(5)
+
+# Hashes of the last emitted docker sections, so unchanged payloads are
+# simply left out of the tick frame (idle dashboards cost ~no bandwidth).
+_last_hashes = {'status': None, 'containers': None, 'connectors': None}
+
+def _status_arrays(status_update):
+    """
+    Converts a status dict to the struct-of-arrays wire layout
+    {'names': [...], 'states': [0/1, ...]}. Parallel arrays with integer
+    states encode far smaller than a wide dict of strings, and partial
+    updates reuse the same shape with a subset of names.
+    """
+    names = list(status_update)
+    return {'names': names,
+            'states': [1 if status_update[name] == 'running' else 0 for name in names]}
 
 def background_monitor():
     """Emits system stats and container status periodically."""
     # Counter to run docker checks less frequently than system stats
     tick = 0
     while True:
+        # Everything collected this cycle goes out as one 'monitor_tick'
+        # frame instead of four separate engine.io packets.
+        payload = {}
+
         # 1. System Stats (Every 2s)
         try:
             stats = get_system_stats()
             # Append RabbitMQ stats to system stats
             stats['rabbitmq'] = get_rabbitmq_stats()
-            socketio.emit('system_stats', stats)
+            payload['stats'] = stats
         except Exception as e:
             print(f"Stats Error: {e}")
 
-        # 2. Docker Status & Container List (Every 4s -> every 2nd tick)
-        if tick % 2 == 0:
-            status_update = get_docker_status_update()
-            socketio.emit('status_update', status_update)
-            
+        # 2. Docker Status & Container List heartbeat (Every 30s -> every
+        # 15th tick). Real-time transitions arrive via _docker_events_loop;
+        # this poll is just a liveness fallback.
+        if tick % 15 == 0:
+            # One docker ps feeds both the status badges and the container table
             container_list = get_running_containers()
-            socketio.emit('container_list', container_list)
+            status_update = get_docker_status_update(container_list)
+
+            # Only ship sections whose content actually changed
+            status_hash = hash(tuple(sorted(status_update.items())))
+            if status_hash != _last_hashes['status']:
+                _last_hashes['status'] = status_hash
+                payload['status'] = _status_arrays(status_update)
+
+            container_hash = hash(tuple((c['id'], c['status']) for c in container_list))
+            if container_hash != _last_hashes['containers']:
+                _last_hashes['containers'] = container_hash
+                payload['containers'] = container_list
 
             # 3. Known Connectors list (Dynamic Discovery)
             connector_list = scan_connectors()
-            socketio.emit('known_connectors', connector_list)
+            connector_hash = hash(tuple((c['name'], c['has_config']) for c in connector_list))
+            if connector_hash != _last_hashes['connectors']:
+                _last_hashes['connectors'] = connector_hash
+                payload['connectors'] = connector_list
+
+        socketio.emit('monitor_tick', payload)
 
         # 4. History Recording (Every 300s = 5 mins -> Every 150 ticks @ 2s each)
         if tick % 150 == 0:
             # Re-fetch fresh stats to ensure accuracy or just reuse 'stats' from above
-            # Using 'stats' from line 159 is fine
             if 'stats' in locals():
                 save_history_point(stats)
-        
+
         tick += 1
         socketio.sleep(2)
 
 @app.route('/')
 def index():
     """Render the dashboard with list of available connectors."""
-    connectors = []
-    if os.path.isdir(CONNECTORS_DIR):
-        try:
-            # List subdirectories in ~/opencti/connectors that contain docker-compose.yml OR .yaml
-            for name in os.listdir(CONNECTORS_DIR):
-                path = os.path.join(CONNECTORS_DIR, name)
-                if os.path.isdir(path):
-                     files = os.listdir(path)
-                     if 'docker-compose.yml' in files or 'docker-compose.yaml' in files:
-                        connectors.append(name)
-        except Exception as e:
-            print(f"Error scanning connectors: {e}")
-    
-    connectors.sort()
+    # Subdirectories of ~/opencti/connectors that contain docker-compose.yml OR .yaml
+    connectors = [name for name, path, compose_file in _scan_connectors_cached() if compose_file]
     return render_template('index.html', connectors=connectors, connectors_dir_display=CONNECTORS_DIR)
 
 @app.route('/api/connector/<name>/config', methods=['GET'])
 def get_connector_config(name):
     """Returns the content of the docker-compose file for a connector."""
     try:
-        path = os.path.join(CONNECTORS_DIR, name)
-        if not os.path.isdir(path):
+        entry = _connector_paths().get(name)
+        if entry is None:
             return {'error': 'Connector not found'}, 404
-        
-        # Check for yml or yaml
-        config_file = None
-        if 'docker-compose.yml' in os.listdir(path):
-            config_file = os.path.join(path, 'docker-compose.yml')
-        elif 'docker-compose.yaml' in os.listdir(path):
-            config_file = os.path.join(path, 'docker-compose.yaml')
-            
+
+        path, config_file = entry
         if not config_file:
             return {'error': 'No docker-compose file found'}, 404
             
@@ -262,25 +513,22 @@ def get_connector_config(name):
 def save_connector_config(name):
     """Saves the config file, creating a backup first."""
     try:
-        path = os.path.join(CONNECTORS_DIR, name)
         data = request.json
         new_content = data.get('content')
-        
-        if not os.path.isdir(path):
+
+        entry = _connector_paths().get(name)
+        if entry is None:
             return {'error': 'Connector not found'}, 404
-            
-        # 1. Check Status (Must be STOPPED)
-        status = check_docker_status(path)
+        path, config_file = entry
+
+        # 1. Check Status (Must be STOPPED). The cached scan already knows
+        # whether a compose file exists, so a bare directory skips the
+        # docker query and falls straight through to the 404 below.
+        status = check_docker_status(path, has_compose=config_file is not None)
         if status == 'running':
             return {'error': 'Cannot edit config while connector is running. Please stop it first.'}, 400
-            
+
         # 2. Identify File
-        config_file = None
-        if 'docker-compose.yml' in os.listdir(path):
-            config_file = os.path.join(path, 'docker-compose.yml')
-        elif 'docker-compose.yaml' in os.listdir(path):
-            config_file = os.path.join(path, 'docker-compose.yaml')
-            
         if not config_file:
             return {'error': 'Original config file not found'}, 404
 
@@ -301,19 +549,57 @@ def save_connector_config(name):
         return {'error': str(e)}, 500
 
 def load_history():
-    """Lengths history from file, handling errors/empty file."""
+    """Loads history from the JSONL file, handling errors/empty file."""
     if not os.path.exists(HISTORY_FILE):
         return []
     try:
-        with open(HISTORY_FILE, 'r') as f:
-            return json.load(f)
+        points = []
+        with open(HISTORY_FILE, 'rb') as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    points.append(orjson.loads(line))
+        return points[-MAX_HISTORY_POINTS:]
     except:
         return []
 
+def _migrate_legacy_history():
+    """
+    One-time migration: seeds the JSONL file from the old single-JSON-array
+    history file so an upgrade doesn't abandon up to 24h of points. Runs at
+    import, before the monitor can create an empty JSONL file.
+    """
+    if os.path.exists(HISTORY_FILE) or not os.path.exists(LEGACY_HISTORY_FILE):
+        return
+    try:
+        with open(LEGACY_HISTORY_FILE, 'r') as f:
+            points = json.load(f)
+        with open(HISTORY_FILE, 'wb') as f:
+            for point in points[-MAX_HISTORY_POINTS:]:
+                f.write(orjson.dumps(point) + b'\n')
+    except Exception as e:
+        print(f"Error migrating legacy history: {e}")
+
+_migrate_legacy_history()
+
+# Appends since the last compaction; the file is rewritten roughly once
+# per 24h so stale points don't accumulate forever.
+_appends_since_compact = 0
+
+def _compact_history():
+    """Rewrites the history file keeping only the newest points."""
+    try:
+        points = load_history()
+        with open(HISTORY_FILE, 'wb') as f:
+            for p in points:
+                f.write(orjson.dumps(p) + b'\n')
+    except Exception as e:
+        print(f"Error compacting history: {e}")
+
 def save_history_point(stats):
-    """Appends a new point and trims old ones."""
-    history = load_history()
-    
+    """Appends a new point to the JSONL file without re-reading old ones."""
+    global _appends_since_compact
+
     point = {
         'timestamp': datetime.now().isoformat(),
         'cpu': stats.get('cpu', 0),
@@ -325,37 +611,71 @@ def save_history_point(stats):
         'mq_rate_in': stats.get('rabbitmq', {}).get('publish_rate', 0) if stats.get('rabbitmq') else 0,
         'mq_rate_out': stats.get('rabbitmq', {}).get('deliver_rate', 0) if stats.get('rabbitmq') else 0
     }
-    history.append(point)
-    
-    # Prune (Keep last 24h)
-    if len(history) > MAX_HISTORY_POINTS:
-        history = history[-MAX_HISTORY_POINTS:]
-        
+
     try:
-        with open(HISTORY_FILE, 'w') as f:
-            json.dump(history, f)
+        with open(HISTORY_FILE, 'ab') as f:
+            f.write(orjson.dumps(point) + b'\n')
     except Exception as e:
         print(f"Error saving history: {e}")
 
+    # Prune (Keep last 24h) via periodic compaction instead of per-write rewrite
+    _appends_since_compact += 1
+    if _appends_since_compact >= MAX_HISTORY_POINTS:
+        _appends_since_compact = 0
+        _compact_history()
+
+# How far back to read when serving history; 64KB comfortably covers
+# MAX_HISTORY_POINTS worth of lines (~200 bytes each).
+HISTORY_TAIL_BYTES = 64 * 1024
+
+def _read_history_tail():
+    """
+    Reads only the last HISTORY_TAIL_BYTES of the JSONL file instead of
+    parsing the whole thing -- O(window) regardless of how large the file
+    has grown since the last compaction.
+    """
+    if not os.path.exists(HISTORY_FILE):
+        return []
+    try:
+        with open(HISTORY_FILE, 'rb') as f:
+            f.seek(0, os.SEEK_END)
+            size = f.tell()
+            f.seek(max(0, size - HISTORY_TAIL_BYTES))
+            chunk = f.read()
+        lines = chunk.split(b'\n')
+        if size > HISTORY_TAIL_BYTES:
+            # The first line is almost certainly cut mid-record
+            lines = lines[1:]
+        points = [orjson.loads(line) for line in lines if line.strip()]
+        return points[-MAX_HISTORY_POINTS:]
+    except Exception:
+        return []
+
 @app.route('/api/stats/history', methods=['GET'])
 def get_stats_history():
-    """Returns the historical data."""
-    return {'data': load_history()}
+    """Returns the historical data (tail of the history file)."""
+    return app.response_class(orjson.dumps({'data': _read_history_tail()}),
+                              mimetype='application/json')
+
+# Console output batching: flush at most every N lines or M seconds so
+# chatty commands (docker compose pull) don't emit one frame per line.
+OUTPUT_BATCH_LINES = 20
+OUTPUT_BATCH_SECS = 0.1
 
 def execute_docker_command(command, cwd):
     """
     Executes a shell command in a specific directory.
-    Streams output line-by-line to SocketIO.
+    Streams output to SocketIO in small batches of lines.
     """
     try:
         # Check if directory exists
         if not os.path.isdir(cwd):
-            socketio.emit('command_output', {'line': f"Error: Directory not found: {cwd}"})
+            socketio.emit('command_output', {'lines': [f"Error: Directory not found: {cwd}"]})
             return
 
-        socketio.emit('command_output', {'line': f"Executing: {' '.join(command)} in {cwd}"})
+        socketio.emit('command_output', {'lines': [f"Executing: {' '.join(command)} in {cwd}"]})
 
-        # Using Popen for non-blocking execution
+        # Using Popen for non-blocking execution (reads are green under eventlet)
         process = subprocess.Popen(
             command,
             cwd=cwd,
@@ -365,25 +685,46 @@ def execute_docker_command(command, cwd):
             text=True
         )
 
+        buf = []
+        last_flush = time.monotonic()
+
+        def flush():
+            nonlocal last_flush
+            if buf:
+                socketio.emit('command_output', {'lines': buf[:]})
+                buf.clear()
+            last_flush = time.monotonic()
+
         for line in process.stdout:
-            socketio.emit('command_output', {'line': line.strip()})
-        
+            buf.append(line.strip())
+            if len(buf) >= OUTPUT_BATCH_LINES or time.monotonic() - last_flush > OUTPUT_BATCH_SECS:
+                flush()
+        flush()
+
         process.wait()
-        
+
         if process.returncode == 0:
-            socketio.emit('command_output', {'line': "SUCCESS: Command completed successfully."})
+            socketio.emit('command_output', {'lines': ["SUCCESS: Command completed successfully."]})
         else:
-            socketio.emit('command_output', {'line': f"FAILURE: Command exited with code {process.returncode}"})
+            socketio.emit('command_output', {'lines': [f"FAILURE: Command exited with code {process.returncode}"]})
         
-        # Force an immediate status update after command completion
+        # Force an immediate status + container refresh after command
+        # completion; the heartbeat is too slow (30s) for user actions.
         try:
-            update = get_docker_status_update()
-            socketio.emit('status_update', update)
+            containers = get_running_containers()
+            update = get_docker_status_update(containers)
+            socketio.emit('monitor_tick', {
+                'status': _status_arrays(update),
+                'containers': containers
+            })
+            # Let the next heartbeat re-hash against fresh content
+            _last_hashes['status'] = None
+            _last_hashes['containers'] = None
         except Exception as e:
              print(f"Post-command status update failed: {e}")
 
     except Exception as e:
-        socketio.emit('command_output', {'line': f"EXCEPTION: {str(e)}"})
+        socketio.emit('command_output', {'lines': [f"EXCEPTION: {str(e)}"]})
 
 
 @socketio.on('docker_action')
@@ -398,10 +739,10 @@ def handle_docker_action(data):
 
     # Security: Validate Action
     if action not in ['up', 'down']:
-        socketio.emit('command_output', {'line': "Error: Invalid action."})
+        socketio.emit('command_output', {'lines': ["Error: Invalid action."]})
         return
 
-    command = ['docker', 'compose', 'up', '-d'] if action == 'up' else ['docker', 'compose', 'down']
+    command = _UP_CMD if action == 'up' else _DOWN_CMD
     
     target_dir = ""
 
@@ -409,31 +750,44 @@ def handle_docker_action(data):
         target_dir = DOCKER_DIR
     elif action_type == 'connector':
         if not target_name or '/' in target_name or '\\' in target_name or '..' in target_name:
-            socketio.emit('command_output', {'line': "Error: Invalid connector name."})
+            socketio.emit('command_output', {'lines': ["Error: Invalid connector name."]})
             return
         target_dir = os.path.join(CONNECTORS_DIR, target_name)
     else:
-        socketio.emit('command_output', {'line': "Error: Unknown target type."})
+        socketio.emit('command_output', {'lines': ["Error: Unknown target type."]})
         return
 
-    # Run in a separate thread so it doesn't block the event loop
-    thread = threading.Thread(target=execute_docker_command, args=(command, target_dir))
-    thread.start()
+    # Run as a background task so it doesn't block the event loop
+    socketio.start_background_task(execute_docker_command, command, target_dir)
 
 @socketio.on('connect')
 def handle_connect():
-    global monitor_thread
-    
-    # Emit immediate status update for better UX on refresh
+    global _monitor_started
+
+    # Emit an immediate full snapshot to this client for better UX on
+    # refresh (the monitor loop skips sections that haven't changed, so a
+    # new client can't rely on the next tick to fill its UI).
     try:
-        update = get_docker_status_update()
-        emit('status_update', update)
+        container_list = get_running_containers()
+        emit('monitor_tick', {
+            'status': _status_arrays(get_docker_status_update(container_list)),
+            'containers': container_list,
+            'connectors': scan_connectors()
+        })
     except Exception as e:
         print(f"Connect status check failed: {e}")
 
-    with thread_lock:
-        if monitor_thread is None:
-            monitor_thread = socketio.start_background_task(background_monitor)
+    if not _monitor_started:
+        _monitor_started = True
+        socketio.start_background_task(background_monitor)
+        socketio.start_background_task(rabbit_poll_loop)
+        socketio.start_background_task(_docker_events_loop)
+
+@socketio.on('request_connectors')
+def handle_request_connectors():
+    """On-demand rescan for the refresh button (the heartbeat is slow)."""
+    emit('monitor_tick', {'connectors': scan_connectors(),
+                          'status': _status_arrays(get_docker_status_update())})
 
 if __name__ == '__main__':
     parser = argparse.ArgumentParser(description='OpenCTI Manager GUI')
@@ -447,12 +801,11 @@ if __name__ == '__main__':
     # Debug: List visible connectors at startup
     if os.path.exists(CONNECTORS_DIR):
         print("Scanned Connectors:")
-        for name in os.listdir(CONNECTORS_DIR):
-            p = os.path.join(CONNECTORS_DIR, name)
-            if os.path.isdir(p):
-                 has_yml = 'docker-compose.yml' in os.listdir(p) or 'docker-compose.yaml' in os.listdir(p)
-                 print(f" - {name}: {'Valid (Found docker-compose)' if has_yml else 'Skipped (No docker-compose.yml/yaml)'}")
+        for name, p, compose_file in _scan_connectors_cached():
+            print(f" - {name}: {'Valid (Found docker-compose)' if compose_file else 'Skipped (No docker-compose.yml/yaml)'}")
     else:
         print(f"Warning: Connectors directory not found at {CONNECTORS_DIR}")
 
-    socketio.run(app, host='0.0.0.0', port=args.port, debug=True)
+    # Eventlet serves both long-polling and WebSocket transports; for
+    # production use: gunicorn --worker-class eventlet -w 1 app:app
+    socketio.run(app, host='0.0.0.0', port=args.port, debug=False)
@@ -186,7 +186,7 @@ socket.on('disconnect', () => {
 });
 
 // System Stats Update (Includes RabbitMQ)
-socket.on('system_stats', (data) => {
+function updateSystemStats(data) {
     // CPU (Just % for now)
     document.getElementById('cpu-val').innerText = data.cpu + '%';
     document.getElementById('cpu-bar').style.width = data.cpu + '%';
@@ -228,14 +228,16 @@ socket.on('system_stats', (data) => {
             mqStatusEl.innerText = `Offline (${mq.error || 'Err'})`;
         }
     }
-});
+}
 
-// Container Status Update (Badges in Controls Tab)
-socket.on('status_update', (data) => {
-    for (const [key, status] of Object.entries(data)) {
+// Container Status Update (Badges in Controls Tab).
+// Struct-of-arrays payload: names[i] is the badge key, states[i] is 1
+// when that stack is running. Partial updates carry a subset of names.
+function updateStatusBadges(data) {
+    data.names.forEach((key, i) => {
         const el = document.getElementById(`status-${key}`);
         if (el) {
-            if (status === 'running') {
+            if (data.states[i] === 1) {
                 el.className = 'badge bg-success ms-2';
                 el.innerText = 'Running';
             } else {
@@ -243,11 +245,11 @@ socket.on('status_update', (data) => {
                 el.innerText = 'Stopped';
             }
         }
-    }
-});
+    });
+}
 
 // Running Containers List Update
-socket.on('container_list', (data) => {
+function renderContainerList(data) {
     const tbody = document.getElementById('containers-table-body');
     tbody.innerHTML = '';
     if (data.length === 0) {
@@ -265,11 +267,25 @@ socket.on('container_list', (data) => {
     </tr>`;
         tbody.innerHTML += row;
     });
+}
+
+// One batched frame per monitor cycle; keys are only present when the
+// server collected that section this tick.
+socket.on('monitor_tick', (data) => {
+    if (data.stats) updateSystemStats(data.stats);
+    if (data.status) updateStatusBadges(data.status);
+    if (data.containers) renderContainerList(data.containers);
+    if (data.connectors) renderKnownConnectors(data.connectors);
 });
 
-// Command Output Streaming
+// Targeted updates outside the monitor loop (connect snapshot, post-command)
+socket.on('status_update', updateStatusBadges);
+
+// Command Output Streaming (server batches lines per frame)
 socket.on('command_output', (data) => {
-    logToTerminal(data.line);
+    for (const line of data.lines) {
+        logToTerminal(line);
+    }
 });
 
 function logToTerminal(text) {
@@ -459,7 +475,7 @@ function refreshConnectors() {
     socket.emit('request_connectors');
 }
 
-socket.on('known_connectors', (list) => {
+function renderKnownConnectors(list) {
     // Stop Spinner
     const btn = document.getElementById('btn-refresh-connectors');
     if (btn) {
@@ -513,7 +529,7 @@ socket.on('known_connectors', (list) => {
     if (list.length === 0 && document.getElementById('connectors-list').children.length === 0) {
         document.getElementById('connectors-list').innerHTML = '<div class="col-12 text-center text-muted p-3">No connectors found.</div>';
     }
-});
+}
 
 function createConnectorHtml(name, hasConfig, uid) {
     if (!hasConfig) {